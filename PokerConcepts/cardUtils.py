@@ -1,22 +1,143 @@
 import cards as cds
-from collections import Counter, UserList
+from collections import Counter
 from typing import List, Sequence, Iterable, Dict, Set, Tuple, Optional, Any
 
-class Hand(UserList):
+class Hand(list):
+	'''A list of cards
+
+Subclasses list directly so that appends, removals and iteration run at
+native list speed instead of through UserList's wrapped data attribute.
+The face and suit lists are cached and only recomputed after the hand
+has been mutated; callers must treat the returned lists as read-only.'''
+
 	def __init__(self, cards: Optional[Iterable[cds.Card]] = None):
-		super().__init__(cards)
+		super().__init__(cards or ())
+		self._faces_cache = None
+		self._suits_cache = None
+
+	def _invalidate_caches(self) -> None:
+		self._faces_cache = None
+		self._suits_cache = None
+
+	def append(self, card: cds.Card) -> None:
+		super().append(card)
+
+		if self._faces_cache is not None:
+			self._faces_cache.append(card.face)
+
+		if self._suits_cache is not None:
+			self._suits_cache.append(card.suit)
+
+	def extend(self, cards: Iterable[cds.Card]) -> None:
+		start = len(self)
+		super().extend(cards)
+
+		if self._faces_cache is not None:
+			self._faces_cache.extend(card.face for card in self[start:])
+
+		if self._suits_cache is not None:
+			self._suits_cache.extend(card.suit for card in self[start:])
+
+	def insert(self, index: int, card: cds.Card) -> None:
+		super().insert(index, card)
+		self._invalidate_caches()
+
+	def remove(self, card: cds.Card) -> None:
+		index = self.index(card)
+		super().__delitem__(index)
+
+		if self._faces_cache is not None:
+			del self._faces_cache[index]
+
+		if self._suits_cache is not None:
+			del self._suits_cache[index]
+
+	def pop(self, index: int = -1) -> cds.Card:
+		card = super().pop(index)
+
+		if self._faces_cache is not None:
+			del self._faces_cache[index]
 
-	def update(cards: Iterable[cds.Card]):
+		if self._suits_cache is not None:
+			del self._suits_cache[index]
+
+		return card
+
+	def clear(self) -> None:
+		super().clear()
+
+		if self._faces_cache is not None:
+			self._faces_cache.clear()
+
+		if self._suits_cache is not None:
+			self._suits_cache.clear()
+
+	def sort(self, **kwargs) -> None:
+		super().sort(**kwargs)
+		self._invalidate_caches()
+
+	def reverse(self) -> None:
+		super().reverse()
+
+		if self._faces_cache is not None:
+			self._faces_cache.reverse()
+
+		if self._suits_cache is not None:
+			self._suits_cache.reverse()
+
+	def __setitem__(self, index, card) -> None:
+		super().__setitem__(index, card)
+		self._invalidate_caches()
+
+	def __delitem__(self, index) -> None:
+		super().__delitem__(index)
+		self._invalidate_caches()
+
+	def __iadd__(self, cards: Iterable[cds.Card]) -> 'Hand':
+		result = super().__iadd__(cards)
+		self._invalidate_caches()
+		return result
+
+	def __imul__(self, count: int) -> 'Hand':
+		result = super().__imul__(count)
+		self._invalidate_caches()
+		return result
+
+	def update(self, cards: Iterable[cds.Card]) -> None:
 		self.clear()
 		self.extend(cards)
 
 	def get_faces(self) -> List[cds.Face]:
 		'''Returns the faces of the cards in a list'''
-		return [card.face for card in self]
+		if self._faces_cache is None:
+			self._faces_cache = [card.face for card in self]
+
+		return self._faces_cache
 
 	def get_suits(self) -> List[cds.Suit]:
 		'''Returns the suits of the cards in a list'''
-		return [card.suit for card in self]
+		if self._suits_cache is None:
+			self._suits_cache = [card.suit for card in self]
+
+		return self._suits_cache
+
+	def get_face_mask(self) -> int:
+		'''Returns a bitmask with one bit set per distinct face, positioned by the face's value'''
+		mask = 0
+
+		for face in self.get_faces():
+			mask |= 1 << face.value
+
+		return mask
+
+	def get_suit_mask(self) -> int:
+		'''Returns a bitmask with one bit set per distinct suit, positioned by the suit's value'''
+		mask = 0
+
+		for suit in self.get_suits():
+			mask |= 1 << suit.value
+
+		return mask
 
 	def get_cards_with_face(self, face: cds.Face) -> List[cds.Card]:
 		'''Returns a list of cards that have same face as the face provided'''
@@ -26,48 +147,51 @@ class Hand(UserList):
 		'''Returns a list of cards that have same suit as the face provided'''
 		return [card for card in self if card.suit == suit]
 
+	def get_face_counts(self) -> Counter:
+		'''Returns a Counter mapping each face to the number of cards that have it'''
+		return Counter(self.get_faces())
+
+	def get_suit_counts(self) -> Counter:
+		'''Returns a Counter mapping each suit to the number of cards that have it'''
+		return Counter(self.get_suits())
+
 	def get_groups_by_face(self) -> Dict[cds.Face, List[cds.Card]]:
 		'''Returns a dictionary where the keys are faces and their values are a list of cards that contain the corresponding face'''
-		groups = {face: [] for face in self.get_faces()}
+		groups = {}
 
 		for card in self:
-			groups[card.face].append(card)
+			groups.setdefault(card.face, []).append(card)
 
 		return groups
 
 	def get_groups_by_suit(self) -> Dict[cds.Suit, List[cds.Card]]:
 		'''Returns a dictionary where the keys are suits and their values are a list of cards that contain the corresponding suit'''
-		groups = {suit: [] for suit in self.get_suits()}
+		groups = {}
 
 		for card in self:
-			groups[card.suit].append(card)
+			groups.setdefault(card.suit, []).append(card)
 
 		return groups
 
 	def get_faces_with_frequency(self, frequency: int) -> List[cds.Face]:
 		'''Returns a list of faces which appear in the same frequency within the cards as the frequency provided'''
-		faces = []
-
-		for face, group in self.get_groups_by_face().items():
-			if len(group) == frequency:
-				faces.append(face)
-				
-		return faces
+		return [face for face, count in self.get_face_counts().items() if count == frequency]
 
 	def get_suits_with_frequency(self, frequency: int) -> List[cds.Suit]:
 		'''Returns a list of suits which appear in the same frequency within the cards as the frequency provided'''
-		suits = []
+		return [suit for suit, count in self.get_suit_counts().items() if count == frequency]
 
-		for suit, group in self.get_groups_by_suit().items():
-			if len(group) == frequency:
-				suits.append(suit)
+def as_hand(cards: Iterable[cds.Card]) -> Hand:
+	'''Returns the cards as a Hand, reusing the object when it already is one
 
-		return suits
+Reuse matters for the validators: a Hand carries its cached face and
+suit summaries, so passing the same Hand through several validators
+computes each summary at most once.'''
+	return cards if isinstance(cards, Hand) else Hand(cards)
 
 def sorted_faces(faces: Iterable[cds.Face], *, reverse: bool = False) -> List[cds.Face]:
 	'''Returns a list of faces sorted by value'''
-	key = lambda face: face.value
-	return sorted(faces, key=key, reverse=reverse)
+	return sorted(faces, reverse=reverse)
 
 def get_max_face(faces: Iterable[cds.Face]) -> cds.Face:
 	'''Returns the face with the greatest value within the provided list of faces'''
@@ -123,8 +247,48 @@ Precedence from least-to-greatest A, 2, 3, 4, 5, 6, 7, 8, 9, 10, J, Q, K'''
 
 	return starter1 == cds.Face.ACE
 
+def _build_sequence_tables() -> Tuple[Dict[Tuple[cds.Face, int], Tuple[cds.Face, ...]], Dict[Tuple[cds.Face, int], Tuple[cds.Face, ...]]]:
+	'''Builds the (starter, length) -> sequence and (face, length) -> starters tables for every face and sequence length'''
+	sequences = {}
+	starter_tables = {}
+
+	for face in cds.Face:
+		for length in range(1, len(cds.Face) + 1):
+			sequence = []
+			cur_face = face
+
+			for _ in range(length):
+				sequence.append(cur_face)
+				cur_face = cds.get_next_face(cur_face)
+
+			sequences[face, length] = tuple(sequence)
+
+			starters = []
+			starter = face
+
+			for _ in range(length):
+
+				if starter in starters:
+					break
+
+				starters.append(starter)
+				starter = cds.get_previous_face(starter)
+
+			starter_tables[face, length] = tuple(starters)
+
+	return sequences, starter_tables
+
+#Sequence and starter tables for every (face, sequence length) pair, built once at import
+_SEQUENCES_BY_STARTER, _STARTERS_BY_FACE = _build_sequence_tables()
+
 def get_sequence_of_starter(starter: cds.Face, *, sequence_length: int) -> List[cds.Face]:
 	'''Returns the sequence of the provided length that the provided face starts'''
+	sequence = _SEQUENCES_BY_STARTER.get((starter, sequence_length))
+
+	if sequence is not None:
+		return list(sequence)
+
+	#Lengths outside the precomputed 1..13 range keep the original walk
 	sequence = []
 	cur_face = starter
 
@@ -136,22 +300,27 @@ def get_sequence_of_starter(starter: cds.Face, *, sequence_length: int) -> List[
 
 def get_starters_of_sequences_including_face(face: cds.Face, *, sequence_length: int, invalid: Optional[Iterable[cds.Face]]=None) -> Set[cds.Face]:
 	'''Returns a set of sequence starters whose sequences of the given length contains the provided face
-	
+
 Can also provide an iterable of faces that are to be excluded from the returned set'''
-	starters = set()
-	starter = face
-	invalid = invalid or set()
+	starters = _STARTERS_BY_FACE.get((face, sequence_length))
 
-	for _ in range(sequence_length):
+	if starters is None:
+		#Lengths outside the precomputed 1..13 range keep the original walk
+		starters = []
+		starter = face
 
-		if starter in starters:
-			break
-		elif starter not in invalid:
-			starters.add(starter)
+		for _ in range(sequence_length):
 
-		starter = cds.get_previous_face(starter)
+			if starter in starters:
+				break
 
-	return starters
+			starters.append(starter)
+			starter = cds.get_previous_face(starter)
+
+	if not invalid:
+		return set(starters)
+
+	return {starter for starter in starters if starter not in invalid}
 
 def get_starters_of_sequences_including_faces(faces: Iterable[cds.Face], *, sequence_length: int, invalid: Optional[Iterable[cds.Face]]=None) -> Counter:
 	'''Returns a Counter of sequence starters whose sequences of the given length contains the provided face
@@ -185,30 +354,37 @@ def get_sequence_including_most_faces(faces: Iterable[cds.Face], *, sequence_len
 
 def sorted_by_frequency(iterable: Iterable[Any], *, reverse: bool = False) -> List[Any]:
 	'''Returns a list sorted by the frequency of the items provided'''
-	key = lambda item: iterable.count(item)
-	return sorted(iterable, key=key, reverse=reverse)
+	items = list(iterable)
+	frequencies = Counter(items)
+	return sorted(items, key=frequencies.__getitem__, reverse=reverse)
 
-def get_first_cards_with_faces(cards: Iterable[cds.Card], *, faces: Iterable[cds.Card]) -> List[cds.Card]:
+def get_first_cards_with_faces(cards: Iterable[cds.Card], *, faces: Iterable[cds.Face]) -> List[cds.Card]:
 	'''Returns a list of the first cards that contain the face in the provided iterable of faces'''
+	wanted_faces = set(faces)
 	first_cards_with_faces = []
-	used_faces = set()
 
 	for card in cards:
-		if card.face in faces and card.face not in used_faces:
+		if card.face in wanted_faces:
 			first_cards_with_faces.append(card)
-			used_faces.add(card.face)
+			wanted_faces.remove(card.face)
+
+			if not wanted_faces:
+				break
 
 	return first_cards_with_faces
 
 def get_first_cards_with_suits(cards: Iterable[cds.Card], *, suits: Iterable[cds.Suit]) -> List[cds.Card]:
 	'''Returns a list of the first cards that contain the suits in the provided iterable of suits'''
+	wanted_suits = set(suits)
 	first_cards_with_suits = []
-	used_suits = set()
 
 	for card in cards:
-		if card.suit in suits and card.suit not in used_suits:
+		if card.suit in wanted_suits:
 			first_cards_with_suits.append(card)
-			used_suits.add(card.suit)
+			wanted_suits.remove(card.suit)
+
+			if not wanted_suits:
+				break
 
 	return first_cards_with_suits
 
@@ -220,7 +396,7 @@ Sorts the pair secondarily by the value of the key
 	- This is done by getting the value of the first card in the value list, then getting its value'''
 
 	groups = []
-	key = lambda tup: (len(tup[1]), sorted(tup[1], reverse=True)[0].value)
+	key = lambda tup: (len(tup[1]), max(tup[1]).value)
 
 	for face, group in sorted(face_group.items(), key=key, reverse=reverse):
 		groups.append((face, group))
@@ -229,20 +405,16 @@ Sorts the pair secondarily by the value of the key
 
 def get_max_face_frequency(cards: Iterable[cds.Card]) -> int:
 	'''Returns the highest frequency of any face in the provided iterable of cards'''
-	hand = Hand(cards)
-	return max(len(group) for group in hand.get_groups_by_face().values())
+	return max(as_hand(cards).get_face_counts().values())
 
 def get_min_face_frequency(cards: Iterable[cds.Card]) -> int:
 	'''Returns the lowest frequency of any face in the provided iterable of cards'''
-	hand = Hand(cards)
-	return min(len(group) for group in hand.get_groups_by_face().values())
+	return min(as_hand(cards).get_face_counts().values())
 
 def get_max_suit_frequency(cards: Iterable[cds.Card]) -> int:
 	'''Returns the highest frequency of any suit in the provided iterable of cards'''
-	hand = Hand(cards)
-	return max(len(group) for group in hand.get_groups_by_suit().values())
+	return max(as_hand(cards).get_suit_counts().values())
 
 def get_min_suit_frequency(cards: Iterable[cds.Card]) -> int:
 	'''Returns the lowest frequency of any suit in the provided iterable of cards'''
-	hand = Hand(cards)
-	return min(len(group) for group in hand.get_groups_by_suit().values())
\ No newline at end of file
+	return min(as_hand(cards).get_suit_counts().values())
\ No newline at end of file
@@ -1,6 +1,6 @@
-from enum import Enum
+from enum import IntEnum
 
-class Face(Enum):
+class Face(IntEnum):
 	TWO = 2
 	THREE = 3
 	FOUR = 4
@@ -15,7 +15,7 @@ class Face(Enum):
 	KING = 13
 	ACE = 14
 
-class Suit(Enum):
+class Suit(IntEnum):
 	SPADES = 0
 	HEARTS = 1
 	CLOVERS = 2
@@ -24,50 +24,77 @@ class Suit(Enum):
 MIN_VALUE = min(face.value for face in Face)
 MAX_VALUE = max(face.value for face in Face)
 
+#One prime per rank (deuce through ace), used so a hand's rank multiset
+#can be summarized as a product of primes
+RANK_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+NUM_OF_RANKS = len(RANK_PRIMES)
+
+def make_card(rank: int, suit: int) -> int:
+	'''Returns a card packed into a single integer
+
+The layout follows the Cactus Kev encoding:
+	- bits 16-28: one-hot bit for the rank (0 = deuce, 12 = ace)
+	- bits 12-15: one-hot bit for the suit
+	- bits 8-11: the rank as a plain integer
+	- bits 0-7: the prime associated with the rank'''
+	return (1 << (16 + rank)) | (1 << (12 + suit)) | (rank << 8) | RANK_PRIMES[rank]
+
+def get_rank_from_code(code: int) -> int:
+	'''Returns the rank (0 = deuce, 12 = ace) of a packed card integer'''
+	return (code >> 8) & 0xF
+
+def get_suit_bit_from_code(code: int) -> int:
+	'''Returns the one-hot suit bit of a packed card integer'''
+	return (code >> 12) & 0xF
+
+def get_prime_from_code(code: int) -> int:
+	'''Returns the rank prime of a packed card integer'''
+	return code & 0xFF
+
 class Card:
+	__slots__ = ('face', 'suit', 'code')
+
 	def __init__(self, face: Face, suit: Suit):
 		self.face = face
 		self.suit = suit
+		self.code = make_card(face.value - MIN_VALUE, suit.value)
 
 	@property
 	def value(self) -> int:
 		return self.face.value
 
 	def __eq__(self, other: 'Card') -> bool:
-		return isinstance(other, Card) and \
-			self.face == other.face and \
-			self.suit == other.suit
+		return isinstance(other, Card) and self.code == other.code
 
 	def __ne__(self, other: 'Card') -> bool:
-		return not isinstance(other, Card) or \
-			self.face != other.face or \
-			self.suit != other.suit
+		return not isinstance(other, Card) or self.code != other.code
 
 	def __hash__(self) -> int:
-		return hash((self.face, self.suit))
+		return self.code
 
 	def __gt__(self, other: 'Card') -> bool:
 		if isinstance(other, Card):
-			return self.value > other.value
-		
+			return (self.code & 0xF00) > (other.code & 0xF00)
+
 		return NotImplemented
 
 	def __ge__(self, other: 'Card') -> bool:
 		if isinstance(other, Card):
-			return self.value >= other.value
-		
+			return (self.code & 0xF00) >= (other.code & 0xF00)
+
 		return NotImplemented
 
 	def __lt__(self, other: 'Card') -> bool:
 		if isinstance(other, Card):
-			return self.value < other.value
-		
+			return (self.code & 0xF00) < (other.code & 0xF00)
+
 		return NotImplemented
 
 	def __le__(self, other: 'Card') -> bool:
 		if isinstance(other, Card):
-			return self.value <= other.value
-		
+			return (self.code & 0xF00) <= (other.code & 0xF00)
+
 		return NotImplemented
 
 	def __repr__(self) -> str:
@@ -77,16 +104,10 @@ class Card:
 		return f'{self.face.name.title()} of {self.suit.name.title()}'
 
 def get_next_face(face: Face) -> Face:
-	try:
-		return Face(face.value + 1)
-	except ValueError:
-		return Face(MIN_VALUE)
+	return Face((face.value - MIN_VALUE + 1) % NUM_OF_RANKS + MIN_VALUE)
 
 def get_previous_face(face: Face) -> Face:
-	try:
-		return Face(face.value - 1)
-	except ValueError:
-		return Face(MAX_VALUE)
+	return Face((face.value - MIN_VALUE - 1) % NUM_OF_RANKS + MIN_VALUE)
 
 def get_face_from_value(value: int) -> Face:
 	'''Returns the Face enum with the same value as the integer provided'''
@@ -0,0 +1,191 @@
+'''Lookup-table evaluation of five-card hands over bit-encoded cards
+
+Every five-card hand belongs to one of 7462 equivalence classes. The tables
+built at import time map a hand to the strength of its class (1 is the royal
+flush, 7462 the worst high card), so comparing two hands reduces to comparing
+two integers. Hands are the packed card integers produced by cards.make_card.'''
+
+from itertools import combinations
+from typing import Sequence, List
+import cards as cds
+
+HAND_LENGTH = 5
+NUM_OF_CLASSES = 7462
+
+#Rank masks of the ten straights from ace-high down to the wheel (five-high)
+STRAIGHT_MASKS = tuple(0b11111 << high for high in range(8, -1, -1)) + ((1 << 12) | 0b1111,)
+
+#Strength tables built at import time by _build_lookup_tables:
+#	FLUSH_LOOKUP: rank mask -> strength, for hands where all suits match
+#	UNIQUE5_LOOKUP: rank mask -> strength, for unsuited hands of five distinct ranks
+#	PRIME_LOOKUP: product of rank primes -> strength, for hands containing a group
+FLUSH_LOOKUP = {}
+UNIQUE5_LOOKUP = {}
+PRIME_LOOKUP = {}
+
+#Hand categories from best to worst and, parallel to them, the greatest
+#(weakest) strength belonging to each category; filled during table building
+CATEGORY_NAMES = (
+	'royal flush',
+	'straight flush',
+	'four of a kind',
+	'full house',
+	'flush',
+	'straight',
+	'three of a kind',
+	'two pair',
+	'pair',
+	'high card',
+)
+CATEGORY_UPPER_BOUNDS = []
+
+def _build_lookup_tables() -> None:
+	'''Fills the three lookup tables by enumerating the 7462 hand classes from best to worst'''
+	primes = cds.RANK_PRIMES
+	ranks_descending = range(cds.NUM_OF_RANKS - 1, -1, -1)
+
+	distinct_rank_masks = sorted(
+		(sum(1 << rank for rank in ranks) for ranks in combinations(range(cds.NUM_OF_RANKS), 5)),
+		reverse=True
+	)
+	non_straight_masks = [mask for mask in distinct_rank_masks if mask not in STRAIGHT_MASKS]
+
+	strength = 0
+
+	#Straight flushes (the royal flush is the ace-high straight flush)
+	for mask in STRAIGHT_MASKS:
+		strength += 1
+		FLUSH_LOOKUP[mask] = strength
+
+	CATEGORY_UPPER_BOUNDS.extend((1, strength))
+
+	#Four of a kind
+	for quad in ranks_descending:
+		for kicker in ranks_descending:
+			if kicker != quad:
+				strength += 1
+				PRIME_LOOKUP[primes[quad] ** 4 * primes[kicker]] = strength
+
+	CATEGORY_UPPER_BOUNDS.append(strength)
+
+	#Full house
+	for triple in ranks_descending:
+		for pair in ranks_descending:
+			if pair != triple:
+				strength += 1
+				PRIME_LOOKUP[primes[triple] ** 3 * primes[pair] ** 2] = strength
+
+	CATEGORY_UPPER_BOUNDS.append(strength)
+
+	#Flushes
+	for mask in non_straight_masks:
+		strength += 1
+		FLUSH_LOOKUP[mask] = strength
+
+	CATEGORY_UPPER_BOUNDS.append(strength)
+
+	#Straights
+	for mask in STRAIGHT_MASKS:
+		strength += 1
+		UNIQUE5_LOOKUP[mask] = strength
+
+	CATEGORY_UPPER_BOUNDS.append(strength)
+
+	#Three of a kind
+	for triple in ranks_descending:
+		for kickers in combinations((rank for rank in ranks_descending if rank != triple), 2):
+			strength += 1
+			PRIME_LOOKUP[primes[triple] ** 3 * primes[kickers[0]] * primes[kickers[1]]] = strength
+
+	CATEGORY_UPPER_BOUNDS.append(strength)
+
+	#Two pair
+	for pairs in combinations(ranks_descending, 2):
+		for kicker in ranks_descending:
+			if kicker not in pairs:
+				strength += 1
+				PRIME_LOOKUP[primes[pairs[0]] ** 2 * primes[pairs[1]] ** 2 * primes[kicker]] = strength
+
+	CATEGORY_UPPER_BOUNDS.append(strength)
+
+	#Pair
+	for pair in ranks_descending:
+		for kickers in combinations((rank for rank in ranks_descending if rank != pair), 3):
+			strength += 1
+			PRIME_LOOKUP[primes[pair] ** 2 * primes[kickers[0]] * primes[kickers[1]] * primes[kickers[2]]] = strength
+
+	CATEGORY_UPPER_BOUNDS.append(strength)
+
+	#High card
+	for mask in non_straight_masks:
+		strength += 1
+		UNIQUE5_LOOKUP[mask] = strength
+
+	CATEGORY_UPPER_BOUNDS.append(strength)
+
+	assert strength == NUM_OF_CLASSES
+	assert len(CATEGORY_UPPER_BOUNDS) == len(CATEGORY_NAMES)
+
+_build_lookup_tables()
+
+def evaluate5(c1: int, c2: int, c3: int, c4: int, c5: int) -> int:
+	'''Returns the strength (1 = best, 7462 = worst) of five packed card integers'''
+	rank_mask = (c1 | c2 | c3 | c4 | c5) >> 16
+
+	if c1 & c2 & c3 & c4 & c5 & 0xF000:
+		return FLUSH_LOOKUP[rank_mask]
+
+	strength = UNIQUE5_LOOKUP.get(rank_mask)
+
+	if strength is not None:
+		return strength
+
+	return PRIME_LOOKUP[(c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF) * (c5 & 0xFF)]
+
+#Release builds may ship a compiled _evaluator extension exposing the same
+#evaluate5(c1..c5) signature over these tables; use it when it is available
+try:
+	from _evaluator import evaluate5
+except ImportError:
+	_ACCELERATED = False
+else:
+	_ACCELERATED = True
+
+def evaluate_hand(cards: Sequence[cds.Card]) -> int:
+	'''Returns the strength (1 = best, 7462 = worst) of a five-card hand of Card objects
+
+The cards must be five distinct cards; callers holding hands that may
+repeat a card should fall back to the rank validators instead.'''
+	c1, c2, c3, c4, c5 = (card.code for card in cards)
+	return evaluate5(c1, c2, c3, c4, c5)
+
+def evaluate_hands(hands: Sequence[Sequence[cds.Card]]) -> List[int]:
+	'''Returns the strengths of several five-card hands in one pass
+
+The table and attribute lookups are hoisted out of the loop so that
+scoring a batch of hands stays close to pure dictionary work. With a
+compiled extension loaded, each hand goes straight through it instead.'''
+	if _ACCELERATED:
+		return [evaluate5(*(card.code for card in hand)) for hand in hands]
+
+	flush_lookup = FLUSH_LOOKUP
+	unique5_lookup = UNIQUE5_LOOKUP.get
+	prime_lookup = PRIME_LOOKUP
+	strengths = []
+
+	for hand in hands:
+		c1, c2, c3, c4, c5 = (card.code for card in hand)
+		rank_mask = (c1 | c2 | c3 | c4 | c5) >> 16
+
+		if c1 & c2 & c3 & c4 & c5 & 0xF000:
+			strengths.append(flush_lookup[rank_mask])
+			continue
+
+		strength = unique5_lookup(rank_mask)
+
+		if strength is None:
+			strength = prime_lookup[(c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF) * (c5 & 0xFF)]
+
+		strengths.append(strength)
+
+	return strengths
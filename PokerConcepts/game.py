@@ -1,4 +1,4 @@
-import cardUtils, ranks, pokerLogic
+import cardUtils, ranks, pokerLogic, evaluator
 import cards as cds
 import random
 from typing import Iterable, List, Sequence, Dict, Callable, TypeVar, Optional
@@ -10,7 +10,7 @@ def create_sequence_target_finder(*, sequence_length: int, invalid_starters: Opt
 	'''Factory function that returns a function that returns a list of the best cards to create a sequence according to the specifications provided'''
 	def get_best_sequence_targets(cards: Sequence[cds.Card]) -> List[cds.Card]:
 		'''Returns a list of the best cards to create a sequence'''
-		hand = cardUtils.Hand(cards)
+		hand = cardUtils.as_hand(cards)
 		faces = hand.get_faces()
 
 		target_faces = cardUtils.get_sequence_including_most_faces(
@@ -24,19 +24,21 @@ def create_sequence_target_finder(*, sequence_length: int, invalid_starters: Opt
 	return get_best_sequence_targets
 
 def create_face_frequency_target_finder(get_min_frequency: Frequency) -> CardKeeper:
-	'''Factory function that returns a function that returns a list of the best cards to form face-frequency-based rank according to the specifications provided'''
-	if not hasattr(get_min_frequency, '__call__'):
-		get_min_frequency_func = lambda cards: get_min_frequency
-	else:
-		get_min_frequency_func = get_min_frequency
+	'''Factory function that returns a function that returns a list of the best cards to form face-frequency-based rank according to the specifications provided
+
+When the minimum frequency is a plain integer, the returned function is
+specialized to compare against that constant directly instead of calling
+a wrapper function for every group.'''
+	is_constant = not hasattr(get_min_frequency, '__call__')
 
 	def get_face_frequency_targets(cards: Sequence[cds.Card]) -> List[cds.Card]:
 		'''Returns a list of the best cards to form face-frequency-based rank'''
 		cards_to_keep = []
-		hand = cardUtils.Hand(cards)
+		hand = cardUtils.as_hand(cards)
+		min_frequency = get_min_frequency if is_constant else get_min_frequency(cards)
 
 		for _, group in cardUtils.get_group_items_by_size_and_value(hand.get_groups_by_face(), reverse=True):
-			if len(group) >= get_min_frequency_func(cards):
+			if len(group) >= min_frequency:
 				cards_to_keep.extend(group)
 			else:
 				break
@@ -46,19 +48,21 @@ def create_face_frequency_target_finder(get_min_frequency: Frequency) -> CardKee
 	return get_face_frequency_targets
 
 def create_suit_frequency_target_finder(get_min_frequency: Frequency) -> CardKeeper:
-	'''Factory function that returns a function that returns a list of the best cards to form suit-frequency-based rank according to the specifications provided'''
-	if not hasattr(get_min_frequency, '__call__'):
-		get_min_frequency_func = lambda cards: get_min_frequency
-	else:
-		get_min_frequency_func = get_min_frequency
+	'''Factory function that returns a function that returns a list of the best cards to form suit-frequency-based rank according to the specifications provided
+
+When the minimum frequency is a plain integer, the returned function is
+specialized to compare against that constant directly instead of calling
+a wrapper function for every group.'''
+	is_constant = not hasattr(get_min_frequency, '__call__')
 
 	def get_suit_frequency_targets(cards: Sequence[cds.Card]) -> List[cds.Card]:
 		'''Returns a list of the best cards to form suit-frequency-based rank'''
 		cards_to_keep = []
-		hand = cardUtils.Hand(cards)
+		hand = cardUtils.as_hand(cards)
+		min_frequency = get_min_frequency if is_constant else get_min_frequency(cards)
 
 		for _, group in cardUtils.get_group_items_by_size_and_value(hand.get_groups_by_suit(), reverse=True):
-			if len(group) >= get_min_frequency_func(cards):
+			if len(group) >= min_frequency:
 				cards_to_keep.extend(group)
 			else:
 				break
@@ -67,11 +71,14 @@ def create_suit_frequency_target_finder(get_min_frequency: Frequency) -> CardKee
 
 	return get_suit_frequency_targets
 
-def get_targets_from_user(cards: Sequence[cds.Card], *, max_discards: int = float('inf')) -> List[cds.Card]:
+def get_targets_from_user(cards: Sequence[cds.Card], *, max_discards: Optional[int] = None) -> List[cds.Card]:
 	'''Allows the user to choose cards to keep and returns those cards in a list'''
 	prompt = 'Press ENTER to stop selecting cards; press a key then ENTER to continue selecting: '
 	chosen = {card: False for card in cards}
 
+	if max_discards is None:
+		max_discards = len(cards)
+
 	get_num_chosen = lambda: sum(chosen.values())
 	display_cards(cards)
 
@@ -104,7 +111,7 @@ def select_card(cards: Sequence[cds.Card]) -> cds.Card:
 
 def get_most_frequent_face_targets(cards: Sequence[cds.Card]) -> List[cds.Card]:
 	'''Returns the list of cards with the most frequent face'''
-	hand = cardUtils.Hand(cards)
+	hand = cardUtils.as_hand(cards)
 	sorted_group_items = cardUtils.get_group_items_by_size_and_value(hand.get_groups_by_face(), reverse=True)
 	cards_to_keep = sorted_group_items[0][1] #Gets the cards that are part of the greatest face group item
 
@@ -112,7 +119,7 @@ def get_most_frequent_face_targets(cards: Sequence[cds.Card]) -> List[cds.Card]:
 
 def get_most_frequent_suit_targets(cards: Sequence[cds.Card]) -> List[cds.Card]:
 	'''Returns the list of cards with the most frequent suit'''
-	hand = cardUtils.Hand(cards)
+	hand = cardUtils.as_hand(cards)
 	sorted_group_items = cardUtils.get_group_items_by_size_and_value(hand.get_groups_by_suit(), reverse=True)
 
 	cards_to_keep = sorted_group_items[0][1] #Gets the cards that are part of the greatest suit group item
@@ -155,10 +162,16 @@ class Discarder:
 		sorted_cards = self.sorted_by_precedence(cards)
 		return self.get_keeper_func(sorted_cards)
 
-	def get_irrelevant_cards(self, cards: Sequence[cds.Card]) -> List[cds.Card]:
-		'''Returns a list of cards that are not targets depending on keeper function'''
-		keeper_cards = self.get_keeper_func(cards)
-		return [card for card in cards if card not in keeper_cards]
+	def get_irrelevant_cards(self, cards: Sequence[cds.Card], *, keeper_cards: Optional[Sequence[cds.Card]] = None) -> List[cds.Card]:
+		'''Returns a list of cards that are not targets depending on keeper function
+
+Accepts already-computed keeper cards so callers that need both lists
+only run the keeper function once.'''
+		if keeper_cards is None:
+			keeper_cards = self.get_keeper_func(cards)
+
+		keeper_card_set = set(keeper_cards)
+		return [card for card in cards if card not in keeper_card_set]
 
 	def sorted_by_precedence(self, cards: Sequence[cds.Card], *, reverse: bool = True) -> Sequence[cds.Card]:
 		'''Sorts from greatest to least by default'''
@@ -228,6 +241,9 @@ class Player:
 		print(self.name)
 		display_cards(self.hand)
 
+#Every card in a standard deck, built once; decks are shuffled copies of this
+FULL_DECK = tuple(cds.Card(face=face, suit=suit) for face in cds.Face for suit in cds.Suit)
+
 class Game:
 	NUM_OF_PLAYERS = 4
 	NUM_OF_ROUNDS = 2
@@ -260,13 +276,7 @@ class Game:
 
 	def initialize_deck(self) -> None:
 		'''Initializes and shuffles the deck'''
-		self.deck = []
-
-		for face in cds.Face:
-			for suit in cds.Suit:
-				card = cds.Card(face=face, suit=suit)
-				self.deck.append(card)
-
+		self.deck = list(FULL_DECK)
 		random.shuffle(self.deck)
 
 	def clear_player_hand(self, player: Player) -> None:
@@ -289,6 +299,23 @@ class Game:
 		player.discard()
 
 	def find_winners(self) -> List[Player]:
+		'''Returns the players holding the best hand
+
+Each full hand is scored exactly once through the lookup-table
+evaluator; pairwise comparison is only used when some hand is not a
+complete five distinct cards.'''
+		hands = [player.hand for player in self.players]
+
+		#A hand repeating a card collapses below five codes and cannot be scored
+		if all(
+			len(hand) == evaluator.HAND_LENGTH == len({card.code for card in hand})
+			for hand in hands
+		):
+			strengths = evaluator.evaluate_hands(hands)
+			best_strength = min(strengths)
+
+			return [player for player, strength in zip(self.players, strengths) if strength == best_strength]
+
 		key_incumbent = self.players[0]
 		incumbents = [key_incumbent]
 
@@ -1,5 +1,5 @@
 from enum import Enum
-import cardUtils, ranks
+import cardUtils, ranks, evaluator
 import cards as cds
 from typing import Iterable, Sequence, Tuple, List, Any
 
@@ -8,10 +8,10 @@ class Comparison(Enum):
 	EQUAL = 0
 	LESSER = -1
 
-#Categories for each rank
-FACE_FREQUENCY_RANKS = (ranks.HIGH, ranks.PAIR, ranks.TWO_PAIR, ranks.THREE_OF_A_KIND, ranks.FULL_HOUSE, ranks.FOUR_OF_A_KIND)
-SEQUENTIAL_RANKS = (ranks.STRAIGHT, ranks.STRAIGHT_FLUSH, ranks.ROYAL_FLUSH)
-SUIT_FREQUENCY_RANKS = (ranks.FLUSH,)
+#Categories for each rank; frozensets so membership is a single hash probe
+FACE_FREQUENCY_RANKS = frozenset((ranks.HIGH, ranks.PAIR, ranks.TWO_PAIR, ranks.THREE_OF_A_KIND, ranks.FULL_HOUSE, ranks.FOUR_OF_A_KIND))
+SEQUENTIAL_RANKS = frozenset((ranks.STRAIGHT, ranks.STRAIGHT_FLUSH, ranks.ROYAL_FLUSH))
+SUIT_FREQUENCY_RANKS = frozenset((ranks.FLUSH,))
 
 def compare_group_items(group_item1: Tuple[cds.Face, List[cds.Card]], group_item2: Tuple[cds.Face, List[cds.Card]]) -> Comparison:
 	'''Compares the two different items of a face group dictionary
@@ -49,8 +49,25 @@ Returns Comparison.EQUAL if the length of the first iterable is equal to the len
 
 def compare_hands(incumbent_hand: Sequence[cds.Card], challenger_hand: Sequence[cds.Card]) -> Comparison:
 	'''Compares hands by the value of their rank
-	
+
 If ranks of both hands are the same, then the contents of their hands are compared depending on the category of their ranks'''
+	if len(incumbent_hand) == evaluator.HAND_LENGTH and len(challenger_hand) == evaluator.HAND_LENGTH:
+		incumbent_codes = frozenset(card.code for card in incumbent_hand)
+		challenger_codes = frozenset(card.code for card in challenger_hand)
+
+		#Duplicated cards collapse in the sets; leave those hands to the rank path
+		if len(incumbent_codes) == len(challenger_codes) == evaluator.HAND_LENGTH:
+			incumbent_strength = evaluator.evaluate5(*incumbent_codes)
+			challenger_strength = evaluator.evaluate5(*challenger_codes)
+
+			#Lesser strength is the better hand
+			if incumbent_strength < challenger_strength:
+				return Comparison.GREATER
+			elif incumbent_strength > challenger_strength:
+				return Comparison.LESSER
+
+			return Comparison.EQUAL
+
 	incumbent_rank, challenger_rank = ranks.get_rank(incumbent_hand), ranks.get_rank(challenger_hand)
 
 	if incumbent_rank > challenger_rank:
@@ -70,8 +87,8 @@ def compare_by_face_frequency(incumbent_hand: Sequence[cds.Card], challenger_han
 	
 If one hand has more cards with the same face than the other hand, then that hand is considered to be greater
 If both hand have cards whose faces appear at the same frequency, then the hand whose cards have greater value is considered greater'''
-	incumbent_groups = cardUtils.Hand(incumbent_hand).get_groups_by_face()
-	challenger_groups = cardUtils.Hand(challenger_hand).get_groups_by_face()
+	incumbent_groups = cardUtils.as_hand(incumbent_hand).get_groups_by_face()
+	challenger_groups = cardUtils.as_hand(challenger_hand).get_groups_by_face()
 
 	group_match_up_generator = zip(
 									cardUtils.get_group_items_by_size_and_value(incumbent_groups, reverse=True),
@@ -90,12 +107,12 @@ def compare_by_straight_starter(incumbent_hand: Sequence[cds.Card], challenger_h
 	'''Compares the values of each card of both hands sorted from the most precedent straight starter to least precedent'''
 	
 	inc_starter = cardUtils.get_most_frequent_starter_of_sequences_including_faces(
-		faces=cardUtils.Hand(incumbent_hand).get_faces(),
+		faces=cardUtils.as_hand(incumbent_hand).get_faces(),
 		sequence_length=ranks.REQUIRED_LENGTH,
 		invalid=ranks.INVALID_STRAIGHT_STARTERS
 	)
 	cha_starter = cardUtils.get_most_frequent_starter_of_sequences_including_faces(
-		faces=cardUtils.Hand(challenger_hand).get_faces(),
+		faces=cardUtils.as_hand(challenger_hand).get_faces(),
 		sequence_length=ranks.REQUIRED_LENGTH,
 		invalid=ranks.INVALID_STRAIGHT_STARTERS
 	)
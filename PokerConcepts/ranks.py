@@ -1,48 +1,65 @@
-from enum import Enum
 from collections import Counter
-from typing import Iterable, Sequence, List, Dict, Optional, Callable, Any
+from enum import Enum
+from functools import lru_cache, total_ordering
+from typing import Iterable, Sequence, List, Dict, Optional, Callable, Any, FrozenSet
 import cards as cds
-import cardUtils
+import cardUtils, evaluator
 
 RankValidator = Callable[[cds.Card], bool]
 
+def fuse_validators(validators: Sequence[RankValidator]) -> RankValidator:
+	'''Returns one callable that and-chains the provided validators
+
+Up to four validators are joined into a single short-circuiting
+expression so checking a rank costs one call instead of a dispatch loop;
+longer tuples fall back to a generator-based all.'''
+	if not validators:
+		return lambda cards: True
+
+	if len(validators) == 1:
+		return validators[0]
+
+	if len(validators) == 2:
+		first, second = validators
+		return lambda cards: first(cards) and second(cards)
+
+	if len(validators) == 3:
+		first, second, third = validators
+		return lambda cards: first(cards) and second(cards) and third(cards)
+
+	if len(validators) == 4:
+		first, second, third, fourth = validators
+		return lambda cards: first(cards) and second(cards) and third(cards) and fourth(cards)
+
+	return lambda cards: all(validator(cards) for validator in validators)
+
+@total_ordering
 class Rank:
+	'''A named hand rank ordered by value
+
+Every rank this module hands out is a module-level singleton (NULL_RANK
+and the members of DEFAULT_RANKS), so callers holding the result of
+get_rank may compare with `is` as well as `==`; in particular
+`Rank.none() is NULL_RANK` always holds.'''
 
 	def __init__(self, name: str, value: int, *, validators: Optional[Iterable[RankValidator]]=None):
 		self.name = name
 		self.value = value
 
-		self.validators = validators or []
+		self.validators = tuple(validators or ())
+		self._check = fuse_validators(self.validators)
 
 	def __eq__(self, other: 'Rank') -> bool:
 		return isinstance(other, Rank) and self.value == other.value
 
-	def __ne__(self, other: 'Rank') -> bool:
-		return not isinstance(other, Rank) or self.value != other.value
-
-	def __gt__(self, other: 'Rank') -> bool:
-		if isinstance(other, Rank):
-			return self.value > other.value
-
-		return NotImplemented
-
-	def __ge__(self, other: 'Rank') -> bool:
-		if isinstance(other, Rank):
-			return self.value >= other.value
-
-		return NotImplemented
-
 	def __lt__(self, other: 'Rank') -> bool:
 		if isinstance(other, Rank):
 			return self.value < other.value
 
 		return NotImplemented
 
-	def __le__(self, other: 'Rank') -> bool:
-		if isinstance(other, Rank):
-			return self.value <= other.value
-
-		return NotImplemented
+	def __hash__(self) -> int:
+		return self.value
 
 	def __repr__(self) -> str:
 		return f'Rank({self.name}, {self.value})'
@@ -50,121 +67,178 @@ class Rank:
 	def is_rank(self, cards: Iterable[cds.Card]) -> bool:
 		'''Returns True if the cards meet the criteria of the validators for the rank
 	Returns False if otherwise'''
-		for validator in self.validators:
-			if not validator(cards):
-				return False
-
-		return True
+		return self._check(cards)
 
 	@classmethod
 	def none(cls) -> 'Rank':
-		'''Returns a null rank'''
-		return cls(name='None', value=0)
+		'''Returns the null rank'''
+		return NULL_RANK
+
+#Width of one frequency level in the multiset signature; wide enough for any Face or Suit value
+_SIGNATURE_LEVEL_WIDTH = 16
+_SIGNATURE_LEVEL_MASK = (1 << _SIGNATURE_LEVEL_WIDTH) - 1
+
+def get_frequency_signature(attributes: Sequence[Any]) -> int:
+	'''Returns the multiset of attributes packed into a single integer
+
+Each attribute sets one bit positioned by its value within the 16-bit
+level selected by its total frequency, so the number of groups of a
+given size is the popcount of that level's slice.'''
+	counts = [0] * _SIGNATURE_LEVEL_WIDTH
+
+	for attribute in attributes:
+		counts[attribute.value] += 1
+
+	signature = 0
+
+	for value, frequency in enumerate(counts):
+		if frequency:
+			signature |= 1 << ((frequency - 1) * _SIGNATURE_LEVEL_WIDTH + value)
+
+	return signature
 
 def has_required_group(attributes: Sequence[Any], group_size: int, num_of_groups: int) -> bool:
 	'''Returns True if their are enough items (num_of_groups) who appear at the given frequency (group size) in the sequence
-Returns False if otherwise'''
-	attribute_frequencies = Counter(attributes)
-	num_of_valid_groups = 0
+Returns False if otherwise
 
-	for frequency in attribute_frequencies.values():
-		if frequency == group_size:
-			num_of_valid_groups += 1
+The packed signature only fits attributes carrying a small integer
+value, like faces and suits; any other attributes are counted plainly.'''
+	try:
+		signature = get_frequency_signature(attributes)
+	except (AttributeError, IndexError, TypeError):
+		return sum(1 for count in Counter(attributes).values() if count == group_size) == num_of_groups
 
-	return num_of_valid_groups == num_of_groups
+	level = signature >> ((group_size - 1) * _SIGNATURE_LEVEL_WIDTH)
+	return (level & _SIGNATURE_LEVEL_MASK).bit_count() == num_of_groups
 
-#Factory functions to create a validators for the default ranks
-def create_length_validator(required_length: int) -> RankValidator:
-	
-	def validate_length(cards):
-		return len(cards) == required_length
+#Validator classes for the default ranks
+#
+#Each validator is a slotted callable object holding its criteria as plain
+#data, so instances are introspectable and carry no closure cells
+class LengthValidator:
+	__slots__ = ('required_length',)
 
-	return validate_length
+	def __init__(self, required_length: int):
+		self.required_length = required_length
 
-def create_sequence_validator(invalid_starters: Optional[Iterable[cds.Face]]=None) -> RankValidator:
+	def __call__(self, cards: Iterable[cds.Card]) -> bool:
+		return len(cards) == self.required_length
 
-	invalid_starters = invalid_starters or set()
+class SequenceValidator:
+	__slots__ = ('invalid_starters', '_sequence_masks_by_length')
 
-	def validate_sequence(cards):
+	def __init__(self, invalid_starters: Optional[Iterable[cds.Face]]=None):
+		self.invalid_starters = frozenset(invalid_starters or ())
+		self._sequence_masks_by_length = {}
 
-		card_group = cardUtils.Hand(cards)
-		sequence_length = len(card_group)
-		faces = card_group.get_faces()
+	def get_sequence_masks(self, sequence_length: int) -> Sequence[int]:
+		'''Returns the face bitmasks of every valid sequence of the provided length, built once per length'''
+		sequence_masks = self._sequence_masks_by_length.get(sequence_length)
 
-		starter = cardUtils.get_most_frequent_starter_of_sequences_including_faces(
-			faces=faces,
-			sequence_length=sequence_length,
-			invalid=invalid_starters
-		)
+		if sequence_masks is None:
+			sequence_masks = tuple(
+				sum(1 << face.value for face in cardUtils.get_sequence_of_starter(starter, sequence_length=sequence_length))
+				for starter in cds.Face if starter not in self.invalid_starters
+			)
+			self._sequence_masks_by_length[sequence_length] = sequence_masks
 
-		for _ in range(sequence_length):
-			if starter not in faces:
-				return False
+		return sequence_masks
 
-			starter = cds.get_next_face(starter)
+	def __call__(self, cards: Iterable[cds.Card]) -> bool:
+		card_group = cardUtils.as_hand(cards)
+		sequence_length = len(card_group)
 
-		return True
+		if sequence_length > len(cds.Face):
+			return False
 
-	return validate_sequence
+		hand_mask = card_group.get_face_mask()
 
-def create_face_validator(required_faces: Iterable[cds.Face]) -> RankValidator:
+		for sequence_mask in self.get_sequence_masks(sequence_length):
+			if hand_mask & sequence_mask == sequence_mask:
+				return True
 
-	def validate_faces(cards):
-		card_group = cardUtils.Hand(cards)
-		faces = card_group.get_faces()
+		return False
 
-		for face in required_faces:
-			if face not in faces:
-				return False
-			
-		return True
+class FaceValidator:
+	__slots__ = ('required_faces', 'required_face_mask')
 
-	return validate_faces
+	def __init__(self, required_faces: Iterable[cds.Face]):
+		self.required_faces = frozenset(required_faces)
+		self.required_face_mask = sum(1 << face.value for face in self.required_faces)
 
-def create_suit_validator(required_suits: Iterable[cds.Suit]) -> RankValidator:
+	def __call__(self, cards: Iterable[cds.Card]) -> bool:
+		required_face_mask = self.required_face_mask
+		return cardUtils.as_hand(cards).get_face_mask() & required_face_mask == required_face_mask
 
-	def validate_suits(cards):
-		card_group = cardUtils.Hand(cards)
-		suits = card_group.get_suits()
+class SuitValidator:
+	__slots__ = ('required_suits', 'required_suit_mask')
 
-		for suit in required_suits:
-			if suit not in suits:
-				return False
-			
-		return True
+	def __init__(self, required_suits: Iterable[cds.Suit]):
+		self.required_suits = frozenset(required_suits)
+		self.required_suit_mask = sum(1 << suit.value for suit in self.required_suits)
 
-	return validate_suits
+	def __call__(self, cards: Iterable[cds.Card]) -> bool:
+		required_suit_mask = self.required_suit_mask
+		return cardUtils.as_hand(cards).get_suit_mask() & required_suit_mask == required_suit_mask
 
-def create_face_frequency_validator(required_frequencies: Dict[int, int]) -> RankValidator:
+class FaceFrequencyValidator:
+	__slots__ = ('required_frequencies',)
+
+	def __init__(self, required_frequencies: Dict[int, int]):
+		#Frozen as sorted (group size, number of groups) pairs at construction
+		self.required_frequencies = tuple(sorted(required_frequencies.items()))
 
-	def validate_face_frequencies(cards):
-		card_group = cardUtils.Hand(cards)
+	def __call__(self, cards: Iterable[cds.Card]) -> bool:
+		card_group = cardUtils.as_hand(cards)
 
-		for group_size, required_num_of_group in required_frequencies.items():
+		for group_size, required_num_of_group in self.required_frequencies:
 			if not has_required_group(card_group.get_faces(), group_size, required_num_of_group):
 				return False
 
 		return True
 
-	return validate_face_frequencies
+class SuitFrequencyValidator:
+	__slots__ = ('required_frequencies',)
 
-def create_suit_frequency_validator(required_frequencies: Dict[int, int]) -> RankValidator:
+	def __init__(self, required_frequencies: Dict[int, int]):
+		#Frozen as sorted (group size, number of groups) pairs at construction
+		self.required_frequencies = tuple(sorted(required_frequencies.items()))
 
-	def validate_suit_frequencies(cards):
-		card_group = cardUtils.Hand(cards)
+	def __call__(self, cards: Iterable[cds.Card]) -> bool:
+		card_group = cardUtils.as_hand(cards)
 
-		for group_size, required_num_of_group in required_frequencies.items():
+		for group_size, required_num_of_group in self.required_frequencies:
 			if not has_required_group(card_group.get_suits(), group_size, required_num_of_group):
 				return False
 
 		return True
 
-	return validate_suit_frequencies
+#Factory functions to create a validators for the default ranks
+def create_length_validator(required_length: int) -> RankValidator:
+	return LengthValidator(required_length)
+
+def create_sequence_validator(invalid_starters: Optional[Iterable[cds.Face]]=None) -> RankValidator:
+	return SequenceValidator(invalid_starters)
+
+def create_face_validator(required_faces: Iterable[cds.Face]) -> RankValidator:
+	return FaceValidator(required_faces)
+
+def create_suit_validator(required_suits: Iterable[cds.Suit]) -> RankValidator:
+	return SuitValidator(required_suits)
+
+def create_face_frequency_validator(required_frequencies: Dict[int, int]) -> RankValidator:
+	return FaceFrequencyValidator(required_frequencies)
+
+def create_suit_frequency_validator(required_frequencies: Dict[int, int]) -> RankValidator:
+	return SuitFrequencyValidator(required_frequencies)
 
 REQUIRED_LENGTH = 5 #Required length of sequence of cards to be in ordered to be considered
 INVALID_STRAIGHT_STARTERS = {cds.Face.JACK, cds.Face.QUEEN, cds.Face.KING}
 ROYAL_FACES = {cds.Face.TEN, cds.Face.JACK, cds.Face.QUEEN, cds.Face.KING, cds.Face.ACE}
 
+#Every default rank requires the same hand length, so they all share one validator instance
+LENGTH_VALIDATOR = create_length_validator(REQUIRED_LENGTH)
+
 NULL_RANK = Rank(
 	name='None',
 	value=0,
@@ -175,7 +249,7 @@ HIGH = Rank(
 	name='High Card',
 	value=1,
 	validators=[
-		create_length_validator(REQUIRED_LENGTH)
+		LENGTH_VALIDATOR
 	]
 )
 
@@ -183,7 +257,7 @@ PAIR = Rank(
 	name='Pair',
 	value=2,
 	validators=[
-		create_length_validator(REQUIRED_LENGTH),
+		LENGTH_VALIDATOR,
 		create_face_frequency_validator({2:1})
 	]
 )
@@ -192,7 +266,7 @@ TWO_PAIR = Rank(
 	name='Two Pair',
 	value=3,
 	validators=[
-		create_length_validator(REQUIRED_LENGTH),
+		LENGTH_VALIDATOR,
 		create_face_frequency_validator({2:2})
 	]
 )
@@ -201,7 +275,7 @@ THREE_OF_A_KIND = Rank(
 	name='Three of a Kind',
 	value=4,
 	validators=[
-		create_length_validator(REQUIRED_LENGTH),
+		LENGTH_VALIDATOR,
 		create_face_frequency_validator({3:1})
 	]
 )
@@ -210,7 +284,7 @@ STRAIGHT = Rank(
 	name='Straight',
 	value=5,
 	validators=[
-		create_length_validator(REQUIRED_LENGTH),
+		LENGTH_VALIDATOR,
 		create_sequence_validator(INVALID_STRAIGHT_STARTERS)
 	]
 )
@@ -219,7 +293,7 @@ FLUSH = Rank(
 	name='Flush',
 	value=6,
 	validators=[
-		create_length_validator(REQUIRED_LENGTH),
+		LENGTH_VALIDATOR,
 		create_suit_frequency_validator({REQUIRED_LENGTH:1})
 	]
 )
@@ -228,7 +302,7 @@ FULL_HOUSE = Rank(
 	name='Full House',
 	value=7,
 	validators=[
-		create_length_validator(REQUIRED_LENGTH),
+		LENGTH_VALIDATOR,
 		create_face_frequency_validator({3:1, 2:1})
 	]
 )
@@ -237,27 +311,32 @@ FOUR_OF_A_KIND = Rank(
 	name='Four of a Kind',
 	value=8,
 	validators=[
-		create_length_validator(REQUIRED_LENGTH),
+		LENGTH_VALIDATOR,
 		create_face_frequency_validator({4:1})
 	]
 )
 
+#The flush check comes before the sequence check in the flush-family ranks:
+#it is both cheaper and more selective, so non-flush hands skip the sequence
+#masks for all three ranks
 STRAIGHT_FLUSH = Rank(
 	name='Straight Flush',
 	value=9,
 	validators=[
-		create_length_validator(REQUIRED_LENGTH),
-		create_sequence_validator(INVALID_STRAIGHT_STARTERS),
-		create_suit_frequency_validator({REQUIRED_LENGTH:1})
+		LENGTH_VALIDATOR,
+		create_suit_frequency_validator({REQUIRED_LENGTH:1}),
+		create_sequence_validator(INVALID_STRAIGHT_STARTERS)
 	]
 )
 
+#Five cards covering the royal face mask are exactly the faces of the
+#ace-high straight, so the face check makes a separate sequence validator
+#redundant; the mask is precomputed by the face validator itself
 ROYAL_FLUSH = Rank(
 	name='Royal Flush',
 	value=10,
 	validators=[
-		create_length_validator(REQUIRED_LENGTH),
-		create_sequence_validator(INVALID_STRAIGHT_STARTERS),
+		LENGTH_VALIDATOR,
 		create_suit_frequency_validator({REQUIRED_LENGTH:1}),
 		create_face_validator(ROYAL_FACES)
 	]
@@ -276,15 +355,74 @@ DEFAULT_RANKS = (
 	HIGH
 )
 
+#The default ranks in the evaluator's category order, so a hand strength maps
+#straight onto its Rank through the category upper bounds
+_RANKS_BY_CATEGORY = (ROYAL_FLUSH, STRAIGHT_FLUSH, FOUR_OF_A_KIND, FULL_HOUSE, FLUSH, STRAIGHT, THREE_OF_A_KIND, TWO_PAIR, PAIR, HIGH)
+_CATEGORY_UPPER_BOUNDS = evaluator.CATEGORY_UPPER_BOUNDS
+
+#Dispatch chain for the default ranks: the shared length validator is checked
+#once up front, so each entry pairs a rank with its remaining validators fused
+#into a single check
+_DEFAULT_RANK_CHAIN = tuple(
+	(rank, fuse_validators(tuple(validator for validator in rank.validators if validator is not LENGTH_VALIDATOR)))
+	for rank in DEFAULT_RANKS
+)
+
+def _build_rank_by_strength() -> Sequence[Rank]:
+	'''Expands the category bounds into a direct strength-indexed Rank table
+
+Index 0 is unused since strengths start at 1.'''
+	table = [NULL_RANK]
+	previous_bound = 0
+
+	for rank, upper_bound in zip(_RANKS_BY_CATEGORY, _CATEGORY_UPPER_BOUNDS):
+		table.extend([rank] * (upper_bound - previous_bound))
+		previous_bound = upper_bound
+
+	return tuple(table)
+
+_RANK_BY_STRENGTH = _build_rank_by_strength()
+
+@lru_cache(maxsize=8192)
+def _get_rank_of_codes(card_codes: FrozenSet[int]) -> Rank:
+	'''Returns the memoized default Rank of a five-card hand given as a frozenset of packed card integers'''
+	return _RANK_BY_STRENGTH[evaluator.evaluate5(*card_codes)]
+
 def get_rank(cards: Sequence[cds.Card], *, ranks: Optional[Sequence[Rank]]=None) -> Rank:
 	'''Returns the highest rank of the given ranks that the hand fulfills
-	
+
 If no ranks are given, then default ranks are used instead
 Returns a null rank if the cards do not fulfill any of the ranks'''
+	if ranks is None and len(cards) == evaluator.HAND_LENGTH:
+		card_codes = frozenset(card.code for card in cards)
+
+		#Duplicated cards collapse in the set; leave those hands to the validators
+		if len(card_codes) == evaluator.HAND_LENGTH:
+			return _get_rank_of_codes(card_codes)
+
 	ranks = ranks or DEFAULT_RANKS
+	cards = cardUtils.as_hand(cards)
+
+	if ranks is DEFAULT_RANKS:
+		if not LENGTH_VALIDATOR(cards):
+			return NULL_RANK
+
+		for rank, check in _DEFAULT_RANK_CHAIN:
+			if check(cards):
+				return rank
+
+		return NULL_RANK
 
 	for rank in ranks:
 		if rank.is_rank(cards):
 			return rank
 
-	return NULL_RANK
\ No newline at end of file
+	return NULL_RANK
+
+def get_ranks(hands: Sequence[Sequence[cds.Card]]) -> List[Rank]:
+	'''Returns the default rank of each five-card hand in the batch
+
+The hands are scored in one pass through the evaluator's batch path, so
+ranking a whole table or a simulation batch avoids per-hand dispatch.'''
+	rank_by_strength = _RANK_BY_STRENGTH
+	return [rank_by_strength[strength] for strength in evaluator.evaluate_hands(hands)]
\ No newline at end of file
@@ -0,0 +1,54 @@
+'''Headless Monte-Carlo simulation of five-card showdowns
+
+Instead of dealing to Player objects, each deal shuffles a flat list of
+packed card integers and scores every player's slice directly through the
+evaluator, so large batches of deals never touch Card objects or hands.'''
+
+import random
+from typing import List, Optional
+import cards as cds
+import evaluator
+
+#The full deck as packed card integers, in the evaluator's native representation
+DECK_CODES = tuple(
+	cds.make_card(rank, suit)
+	for rank in range(cds.NUM_OF_RANKS)
+	for suit in range(len(cds.Suit))
+)
+
+def deal_strengths(deck_codes: List[int], num_of_players: int, rng: random.Random) -> List[int]:
+	'''Shuffles the deck codes in place and returns each player's hand strength
+
+Players receive consecutive five-card slices off the top of the deck.'''
+	rng.shuffle(deck_codes)
+	evaluate5 = evaluator.evaluate5
+	strengths = []
+
+	for player in range(num_of_players):
+		start = player * evaluator.HAND_LENGTH
+		c1, c2, c3, c4, c5 = deck_codes[start:start + evaluator.HAND_LENGTH]
+		strengths.append(evaluate5(c1, c2, c3, c4, c5))
+
+	return strengths
+
+def simulate_win_counts(*, num_of_players: int, num_of_deals: int, seed: Optional[int] = None) -> List[int]:
+	'''Returns how many deals each seat won across the simulated showdowns
+
+Seats that split a pot are each credited with a win. The deck is
+shuffled once per deal and reused across the whole batch.'''
+	if num_of_players * evaluator.HAND_LENGTH > len(DECK_CODES):
+		raise ValueError('Not enough cards in the deck for that many players')
+
+	rng = random.Random(seed)
+	deck_codes = list(DECK_CODES)
+	win_counts = [0] * num_of_players
+
+	for _ in range(num_of_deals):
+		strengths = deal_strengths(deck_codes, num_of_players, rng)
+		best_strength = min(strengths)
+
+		for seat, strength in enumerate(strengths):
+			if strength == best_strength:
+				win_counts[seat] += 1
+
+	return win_counts